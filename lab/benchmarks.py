@@ -0,0 +1,238 @@
+"""
+Benchmarks for the lab helpers.
+
+Usage: python benchmarks.py import-time [--repeats N] [--budget S] [--report report.json]
+       python benchmarks.py optimizers [submission.py] [--sizes 1e2 1e4 ...] [--report report.json]
+
+`import-time` measures the cold-start import of `utils` and `checker`, each in a fresh
+interpreter, and exits with an error when the median exceeds `--budget` seconds, so that a
+heavy import creeping back into module load is caught.
+
+`optimizers` times the steps of the optimizers configured in `checker.test_params` and their
+`torch.optim` counterparts, with the same hyperparameters, on parameters of growing size, and
+reports the size of the optimizer state. On CUDA it also reports the peak memory allocated
+during the steps on top of the parameters and gradients (state plus temporaries). The custom
+optimizers are taken from `submission.py` (e.g. `02c_optimizers.ipynb` exported with
+`jupyter nbconvert --to script`); without it only the `torch.optim` ones are measured.
+"""
+import argparse
+import json
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence
+
+import utils
+
+if TYPE_CHECKING:
+    import torch
+else:
+    torch = utils.LazyModule("torch")
+
+_LAB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_TIMED_IMPORT = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _time_import(module: str) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", _TIMED_IMPORT.format(module=module)],
+        cwd=_LAB_DIR,
+        env={**os.environ, "MPLBACKEND": "Agg"},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def benchmark_import_time(
+    modules: Sequence[str] = ("utils", "checker"), repeats: int = 5
+) -> Dict[str, Dict[str, Any]]:
+    """Seconds spent in `import module` by a fresh interpreter, `repeats` times per module."""
+    results = {}
+    for module in modules:
+        times = [_time_import(module) for _ in range(repeats)]
+        results[module] = {"median": statistics.median(times), "min": min(times), "times": times}
+    return results
+
+
+def _split_params(n_params: int, n_tensors: int, device: torch.device) -> List[torch.Tensor]:
+    """`n_params` parameters in `n_tensors` tensors on `device`, with fixed random gradients."""
+    sizes = [n_params // n_tensors + (idx < n_params % n_tensors) for idx in range(n_tensors)]
+    generator = torch.Generator().manual_seed(0)
+    params = []
+    for size in filter(None, sizes):
+        param = torch.randn(size, generator=generator).to(device).requires_grad_(True)
+        param.grad = torch.randn(size, generator=generator).to(device)
+        params.append(param)
+    return params
+
+
+def _state_bytes(optimizer: Any, params: List[torch.Tensor]) -> int:
+    """Bytes of the tensors held by `optimizer`, except the parameters and their gradients."""
+    excluded = {t.data_ptr() for param in params for t in (param, param.grad) if t is not None}
+    seen, total, pending = set(), 0, [vars(optimizer)]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, torch.Tensor):
+            if value.data_ptr() not in excluded and value.data_ptr() not in seen:
+                seen.add(value.data_ptr())
+                total += value.untyped_storage().nbytes()
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return total
+
+
+def _time_steps(step: Callable[[], None], min_seconds: float, device: torch.device) -> float:
+    """Steps per second of `step`, called repeatedly for at least `min_seconds`."""
+    step()  # warm-up, allocates the state
+    n_steps, start = 0, time.perf_counter()
+    while True:
+        step()
+        n_steps += 1
+        if device.type == "cuda":
+            torch.cuda.synchronize(device)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return n_steps / elapsed
+
+
+def benchmark_optimizers(
+    optimizers: Dict[str, type],
+    sizes: Sequence[int] = (10**2, 10**3, 10**4, 10**5, 10**6, 10**7),
+    n_tensors: int = 10,
+    min_seconds: float = 0.5,
+    device: str | torch.device | None = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Steps per second and optimizer state size of the custom `optimizers` (name -> class) and
+    their `torch.optim` counterparts from `checker.test_params`, for each number of parameters
+    in `sizes`, split into `n_tensors` tensors. Names without a custom class are measured for
+    `torch.optim` only. `device` defaults to CUDA when available; there `peak_bytes` is the
+    most memory allocated during the steps beyond the parameters and gradients.
+    """
+    import checker
+
+    if device is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    device = torch.device(device)
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for name, config in checker.test_params.items():
+        candidates = {"torch": lambda params: config["torch_cls"](params, **config["torch_params"])}
+        if name in optimizers:
+            candidates["custom"] = lambda params: optimizers[name](params, **config["params"])
+        results[name] = []
+        for n_params in sizes:
+            entry: Dict[str, Any] = {"n_params": n_params, "n_tensors": min(n_tensors, n_params)}
+            for kind, make_optimizer in candidates.items():
+                params = _split_params(n_params, n_tensors, device)
+                if device.type == "cuda":
+                    torch.cuda.synchronize(device)
+                    torch.cuda.reset_peak_memory_stats(device)
+                    allocated = torch.cuda.memory_allocated(device)
+                optimizer = make_optimizer(params)
+                steps_per_second = _time_steps(optimizer.step, min_seconds, device)
+                entry[kind] = {
+                    "steps_per_second": steps_per_second,
+                    "params_per_second": steps_per_second * n_params,
+                    "state_bytes": _state_bytes(optimizer, params),
+                }
+                if device.type == "cuda":
+                    peak_bytes = torch.cuda.max_memory_allocated(device) - allocated
+                    entry[kind]["peak_bytes"] = peak_bytes
+                del optimizer, params
+            if "custom" in entry:
+                speedup = entry["custom"]["steps_per_second"] / entry["torch"]["steps_per_second"]
+                entry["speedup"] = speedup
+            results[name].append(entry)
+    return results
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks for the lab helpers.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    import_time = subparsers.add_parser("import-time", help="cold-start import time")
+    import_time.add_argument("modules", nargs="*", default=["utils", "checker"])
+    import_time.add_argument("--repeats", type=int, default=5)
+    import_time.add_argument("--budget", type=float, default=None, help="max median seconds")
+    import_time.add_argument("--report", default=None, help="where to write the JSON report")
+
+    optimizers = subparsers.add_parser("optimizers", help="custom optimizers vs torch.optim")
+    optimizers.add_argument("submission", nargs="?", default=None, help="custom optimizers")
+    default_sizes = [1e2, 1e3, 1e4, 1e5, 1e6, 1e7]
+    optimizers.add_argument("--sizes", type=float, nargs="+", default=default_sizes)
+    optimizers.add_argument("--device", default=None, help="default: cuda if available")
+    optimizers.add_argument("--tensors", type=int, default=10, help="parameter tensors per model")
+    optimizers.add_argument("--min-seconds", type=float, default=0.5, help="timing per measurement")
+    optimizers.add_argument("--report", default=None, help="where to write the JSON report")
+
+    args = parser.parse_args(argv)
+    if args.benchmark == "optimizers":
+        return _run_optimizers(args)
+
+    report = benchmark_import_time(args.modules, repeats=args.repeats)
+    status = 0
+    for module, result in report.items():
+        over_budget = args.budget is not None and result["median"] > args.budget
+        status = status or int(over_budget)
+        flag = "  over budget" if over_budget else ""
+        print(f"{module:>10} median {result['median']:.3f} s  min {result['min']:.3f} s{flag}")
+
+    if args.report is not None:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return status
+
+
+def _run_optimizers(args: argparse.Namespace) -> int:
+    namespace = {}
+    if args.submission is not None:
+        namespace = runpy.run_path(args.submission, run_name="__benchmark__")
+    optimizers = {name: cls for name, cls in namespace.items() if isinstance(cls, type)}
+    results = benchmark_optimizers(
+        optimizers,
+        sizes=[int(size) for size in args.sizes],
+        n_tensors=args.tensors,
+        min_seconds=args.min_seconds,
+        device=args.device,
+    )
+    for name, entries in results.items():
+        print(name)
+        for entry in entries:
+            line = f"  {entry['n_params']:>10} params"
+            for kind in ("custom", "torch"):
+                if kind in entry:
+                    result = entry[kind]
+                    line += f"  {kind} {result['steps_per_second']:10.1f} steps/s"
+                    line += f" state {result['state_bytes'] / 2**20:8.2f} MB"
+                    if "peak_bytes" in result:
+                        line += f" peak {result['peak_bytes'] / 2**20:8.2f} MB"
+            if "speedup" in entry:
+                line += f"  x{entry['speedup']:.2f}"
+            print(line)
+
+    if args.report is not None:
+        report = {
+            "torch_version": torch.__version__,
+            "num_threads": torch.get_num_threads(),
+            "device": args.device or ("cuda" if torch.cuda.is_available() else "cpu"),
+            "n_tensors": args.tensors,
+            "results": results,
+        }
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
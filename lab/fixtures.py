@@ -0,0 +1,176 @@
+"""
+Golden fixtures used by `checker`, stored in a single indexed archive (`.checker/fixtures.bin`).
+
+Usage: python fixtures.py list
+       python fixtures.py regenerate reference.py [reference.py ...]
+
+The archive is an 8-byte magic, a little-endian uint64 header size and a JSON header mapping
+each fixture name to its kind, dtype, shape and offset, followed by the raw array buffers
+(64-byte aligned). Fixtures are read through one copy-on-write memory map, so loading one is
+a zero-copy view and processes forked after opening the archive share its pages.
+
+`regenerate` runs reference implementations (e.g. a solved notebook exported with
+`jupyter nbconvert --to script`) and rewrites the fixtures they produce, see
+`checker.FIXTURE_GENERATORS`. A reference script may also define a `reference_fixtures`
+dict of name -> array/tensor, e.g. the outputs of the GNN notebook layers, to set those
+entries directly.
+"""
+import argparse
+import functools
+import json
+import mmap
+import os
+import runpy
+import struct
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import numpy as np
+
+import utils
+
+if TYPE_CHECKING:
+    import torch
+else:
+    torch = utils.LazyModule("torch")
+
+MAGIC = b"LABFIX01"
+ALIGNMENT = 64
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".checker", "fixtures.bin")
+
+
+class FixtureArchive:
+    """Read-only view of an archive written by `write_archive`."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if self._buffer[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a fixture archive")
+        (header_size,) = struct.unpack_from("<Q", self._buffer, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        self.index: Dict[str, Dict[str, Any]] = json.loads(
+            self._buffer[header_start : header_start + header_size]
+        )
+        self._data_start = _align(header_start + header_size)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def names(self) -> List[str]:
+        return sorted(self.index)
+
+    def array(self, name: str) -> np.ndarray:
+        entry = self.index[name]
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        offset = self._data_start + entry["offset"]
+        return np.frombuffer(self._buffer, dtype=dtype, count=count, offset=offset).reshape(
+            entry["shape"]
+        )
+
+    def __getitem__(self, name: str) -> Any:
+        """The fixture as it was stored: a `torch.Tensor`, an `np.ndarray` or a Python scalar."""
+        return _from_array(self.index[name]["kind"], self.array(name))
+
+    def copy(self, name: str) -> Any:
+        """Like `archive[name]`, but not backed by the memory map."""
+        return _from_array(self.index[name]["kind"], self.array(name).copy())
+
+
+def _from_array(kind: str, array: np.ndarray) -> Any:
+    if kind == "tensor":
+        return torch.from_numpy(array)
+    if kind == "scalar":
+        return array.item()
+    return array
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _as_entry(value: Any) -> tuple:
+    if isinstance(value, np.ndarray):
+        return "array", value
+    if isinstance(value, (int, float, np.generic)):
+        return "scalar", np.asarray(value)
+    return "tensor", value.detach().cpu().numpy()
+
+
+def write_archive(fixtures: Dict[str, Any], path: str = DEFAULT_PATH) -> None:
+    """Writes `fixtures` (name -> tensor, array or scalar) to `path`, replacing it atomically."""
+    index, arrays, offset = {}, [], 0
+    for name in sorted(fixtures):
+        kind, array = _as_entry(fixtures[name])
+        array = array.astype(array.dtype.newbyteorder("<"), order="C", copy=False)
+        index[name] = {
+            "kind": kind,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        arrays.append((offset, array))
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps(index, indent=1).encode()
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    def write(f: Any) -> None:
+        f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        for array_offset, array in arrays:
+            f.seek(data_start + array_offset)
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    utils._write_atomic(path, write)
+
+
+@functools.lru_cache(maxsize=None)
+def open_archive(path: str = DEFAULT_PATH) -> FixtureArchive:
+    return FixtureArchive(path)
+
+
+def regenerate(reference_paths: List[str], path: str = DEFAULT_PATH) -> List[str]:
+    """Recomputes fixtures from the reference implementations; returns the names rewritten."""
+    import checker
+
+    archive = FixtureArchive(path)
+    fixtures = {name: archive.copy(name) for name in archive.names()}
+    updated = {}
+    for reference_path in reference_paths:
+        namespace = runpy.run_path(reference_path, run_name="__reference__")
+        for reference_name, generate in checker.FIXTURE_GENERATORS.items():
+            if reference_name in namespace:
+                updated.update(generate(namespace[reference_name]))
+        updated.update(namespace.get("reference_fixtures", {}))
+
+    fixtures.update(updated)
+    write_archive(fixtures, path)
+    return sorted(updated)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or regenerate the checker fixtures.")
+    parser.add_argument("--archive", default=DEFAULT_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="list the fixtures in the archive")
+    regenerate_parser = subparsers.add_parser("regenerate", help="recompute fixtures")
+    regenerate_parser.add_argument("references", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        archive = FixtureArchive(args.archive)
+        for name in archive.names():
+            entry = archive.index[name]
+            print(f"{name:<45} {entry['kind']:<7} {entry['dtype']:<4} {tuple(entry['shape'])}")
+    else:
+        for name in regenerate(args.references, args.archive):
+            print(f"regenerated {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+Runs the `checker` entry points against student submissions.
+
+Usage: python grader.py submission.py [submission.py ...] [--workers N] [--timeout S]
+                         [--report report.json]
+
+A submission is a Python file (e.g. a notebook exported with `jupyter nbconvert --to script`).
+It is executed once, in a forked process that is killed if loading takes longer than the
+timeout, and from there every check whose arguments it defines is run in its own forked
+process. The golden fixtures are decoded once, before forking, and are shared by all checks
+of all submissions.
+"""
+import argparse
+import inspect
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import runpy
+import time
+import traceback
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Tuple
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import checker
+
+GradingJob = namedtuple("GradingJob", ["check", "args"])
+CheckResult = namedtuple("CheckResult", ["check", "args", "status", "seconds", "error"])
+
+# Names of the submission objects passed to each entry point, one tuple per call.
+CHECK_ARGUMENTS: Dict[str, List[Tuple[str, ...]]] = {
+    "check_closest": [("closest",)],
+    "check_poly": [("poly",)],
+    "check_multiplication_table": [("multiplication_table",)],
+    "check_1_1": [("mean_error", "mean_squared_error", "max_error", "train_sets")],
+    "check_1_2": [("minimize_me", "minimize_mse", "minimize_max", "train_set_1d")],
+    "check_1_3": [("me_grad", "mse_grad", "max_grad", "train_sets")],
+    "check_02_linear_regression": [("LinearRegression",)],
+    "check_02_regularized_linear_regression": [("RegularizedLinearRegression",)],
+    "check_4_1_mse": [("mean_squared_error", "multi_datasets")],
+    "check_4_1_me": [("mean_error", "multi_datasets")],
+    "check_4_1_max": [("max_error", "multi_datasets")],
+    "check_4_1_lin_reg": [("linear_regression_loss", "diabetes_data")],
+    "check_4_1_reg_reg": [("regularized_regression_loss", "diabetes_data")],
+    "check_04_logistic_reg": [("LogisticRegression",)],
+    "test_optimizer": [(name,) for name in checker.test_params],
+    "test_droput": [("Dropout",)],
+    "test_bn": [("BatchNorm",)],
+}
+
+
+def discover_checks() -> Dict[str, Callable]:
+    return {
+        name: fn
+        for name, fn in inspect.getmembers(checker, inspect.isfunction)
+        if name.startswith(("check_", "test_")) and fn.__module__ == checker.__name__
+    }
+
+
+def default_jobs() -> List[GradingJob]:
+    return [
+        GradingJob(name, args)
+        for name in discover_checks()
+        for args in CHECK_ARGUMENTS.get(name, [])
+    ]
+
+
+def _execute(fn: Callable, args: List[Any]) -> Tuple[str, float, str | None]:
+    start = time.perf_counter()
+    try:
+        fn(*args)
+        status, error = "passed", None
+    except AssertionError:
+        status, error = "failed", traceback.format_exc()
+    except Exception:
+        status, error = "error", traceback.format_exc()
+    return status, time.perf_counter() - start, error
+
+
+def _execute_in_child(
+    fn: Callable, args: List[Any], connection: multiprocessing.connection.Connection
+) -> None:
+    connection.send(_execute(fn, args))
+    connection.close()
+
+
+def run_checks(
+    jobs: List[GradingJob],
+    namespace: Dict[str, Any],
+    max_workers: int | None = None,
+    timeout: float = 120.0,
+) -> List[CheckResult]:
+    """
+    Runs `jobs` with arguments looked up in `namespace`, at most `max_workers` at a time, each
+    in a forked process that is killed after `timeout` seconds. Without `fork` the jobs run
+    serially in this process and `timeout` is not enforced.
+    """
+    checks = discover_checks()
+    max_workers = max_workers or os.cpu_count() or 1
+    results: Dict[int, CheckResult] = {}
+    pending = []
+    for idx, job in enumerate(jobs):
+        missing = [name for name in job.args if name not in namespace]
+        if missing:
+            results[idx] = CheckResult(*job, "skipped", 0.0, f"not defined: {', '.join(missing)}")
+        else:
+            pending.append(idx)
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        for idx in pending:
+            job = jobs[idx]
+            outcome = _execute(checks[job.check], [namespace[name] for name in job.args])
+            results[idx] = CheckResult(*job, *outcome)
+        return [results[idx] for idx in range(len(jobs))]
+
+    context = multiprocessing.get_context("fork")
+    running: Dict[Any, Tuple[int, Any, Any, float]] = {}
+    while pending or running:
+        while pending and len(running) < max_workers:
+            idx = pending.pop(0)
+            job = jobs[idx]
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_execute_in_child,
+                args=(checks[job.check], [namespace[name] for name in job.args], sender),
+                daemon=True,
+            )
+            process.start()
+            sender.close()
+            running[receiver] = (idx, process, receiver, time.perf_counter())
+
+        ready = multiprocessing.connection.wait(list(running), timeout=0.1)
+        now = time.perf_counter()
+        for receiver in list(running):
+            idx, process, _, start = running[receiver]
+            if receiver in ready:
+                try:
+                    outcome = receiver.recv()
+                except EOFError:
+                    process.join()
+                    outcome = ("error", now - start, f"exited with code {process.exitcode}")
+            elif now - start > timeout:
+                process.kill()
+                outcome = ("timeout", now - start, f"exceeded {timeout} s")
+            else:
+                continue
+            process.join()
+            receiver.close()
+            del running[receiver]
+            results[idx] = CheckResult(*jobs[idx], *outcome)
+
+    return [results[idx] for idx in range(len(jobs))]
+
+
+def _load_submission(path: str) -> Tuple[Dict[str, Any] | None, Dict[str, Any]]:
+    load_start = time.perf_counter()
+    try:
+        namespace = runpy.run_path(path, run_name="__submission__")
+    except Exception:
+        return None, {
+            "load_seconds": time.perf_counter() - load_start,
+            "load_error": traceback.format_exc(),
+            "checks": [],
+        }
+    return namespace, {"load_seconds": time.perf_counter() - load_start}
+
+
+def _grade(
+    path: str, jobs: List[GradingJob], max_workers: int | None, timeout: float
+) -> Dict[str, Any]:
+    namespace, submission = _load_submission(path)
+    if namespace is not None:
+        results = run_checks(jobs, namespace, max_workers=max_workers, timeout=timeout)
+        submission["checks"] = [result._asdict() for result in results]
+    return submission
+
+
+def _grade_submission_in_child(
+    path: str,
+    jobs: List[GradingJob],
+    max_workers: int | None,
+    timeout: float,
+    connection: multiprocessing.connection.Connection,
+) -> None:
+    namespace, submission = _load_submission(path)
+    connection.send(submission)  # tells the parent that loading has finished
+    if namespace is not None:
+        results = run_checks(jobs, namespace, max_workers=max_workers, timeout=timeout)
+        connection.send([result._asdict() for result in results])
+    connection.close()
+
+
+def _grade_in_child(
+    path: str, jobs: List[GradingJob], max_workers: int | None, timeout: float
+) -> Dict[str, Any]:
+    """
+    Like `_grade`, but the submission is executed in a forked process, killed if loading takes
+    longer than `timeout` seconds. The checks, with their own timeouts, are run from there.
+    """
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    # not a daemon, since it forks the processes running the checks
+    process = context.Process(
+        target=_grade_submission_in_child, args=(path, jobs, max_workers, timeout, sender)
+    )
+    start = time.perf_counter()
+    process.start()
+    sender.close()
+    submission: Dict[str, Any] | None = None
+    try:
+        if not receiver.poll(timeout):
+            process.kill()
+            error = f"loading exceeded {timeout} s"
+            return {"load_seconds": time.perf_counter() - start, "load_error": error, "checks": []}
+        submission = receiver.recv()
+        if "load_error" not in submission:
+            submission["checks"] = receiver.recv()
+        return submission
+    except EOFError:
+        process.join()
+        error = f"exited with code {process.exitcode}"
+        if submission is None:
+            return {"load_seconds": time.perf_counter() - start, "load_error": error, "checks": []}
+        return {**submission, "error": error, "checks": []}
+    finally:
+        process.join()
+        receiver.close()
+
+
+def grade_submissions(
+    paths: List[str],
+    jobs: List[GradingJob] | None = None,
+    max_workers: int | None = None,
+    timeout: float = 120.0,
+) -> Dict[str, Any]:
+    """Grades every submission in `paths` and returns a JSON-serialisable timing report."""
+    if jobs is None:
+        jobs = default_jobs()
+    start = time.perf_counter()
+    checker.preload_fixtures()
+    report: Dict[str, Any] = {"fixtures_seconds": time.perf_counter() - start, "submissions": {}}
+
+    for path in paths:
+        if "fork" in multiprocessing.get_all_start_methods():
+            report["submissions"][path] = _grade_in_child(path, jobs, max_workers, timeout)
+        else:
+            report["submissions"][path] = _grade(path, jobs, max_workers, timeout)
+
+    report["total_seconds"] = time.perf_counter() - start
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Grade submissions with the checker module.")
+    parser.add_argument("submissions", nargs="+")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--report", default=None, help="where to write the JSON report")
+    args = parser.parse_args()
+
+    report = grade_submissions(args.submissions, max_workers=args.workers, timeout=args.timeout)
+    for path, submission in report["submissions"].items():
+        print(path)
+        if "load_error" in submission:
+            print(f"  could not be loaded:\n{submission['load_error']}")
+        if "error" in submission:
+            print(f"  grading failed: {submission['error']}")
+        for result in submission["checks"]:
+            if result["status"] != "skipped":
+                call = f"{result['check']}({', '.join(result['args'])})"
+                print(f"  {result['status']:>7} {result['seconds']:8.3f} s  {call}")
+    print(f"total: {report['total_seconds']:.2f} s")
+
+    if args.report is not None:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()